@@ -1,7 +1,11 @@
 import streamlit as st
+import asyncio
 import base64
+import copy
+import hashlib
 import tempfile
 import os
+import shutil
 import json
 import re
 from datetime import datetime
@@ -10,7 +14,201 @@ from PIL import Image
 import io
 from dotenv import load_dotenv
 
-def upload_pdf(client, content, filename):
+# Read size for streaming PDFs into base64; must stay a multiple of 3.
+PDF_ENCODE_CHUNK_SIZE = 57 * 1024
+
+# Buffer size used when copying or hashing uploaded files.
+FILE_COPY_CHUNK_SIZE = 64 * 1024
+
+# Images sent to OCR are downscaled to this many pixels on the longest side.
+MAX_IMAGE_DIMENSION = 2000
+JPEG_QUALITY = 85
+
+WORD_RE = re.compile(r"\S+")
+
+# Maximum number of resumes processed concurrently in batch mode.
+BATCH_CONCURRENCY = 8
+
+# Template returned when resume extraction fails; copy it before mutating.
+EMPTY_RESUME = {
+    "basics": {
+        "name": "",
+        "email": "",
+        "phone": "",
+        "location": "",
+        "website": "",
+        "linkedin": "",
+        "summary": ""
+    },
+    "work": [],
+    "education": [],
+    "skills": {
+        "technical": [],
+        "professional": [],
+        "languages_programming": [],
+        "tools": []
+    },
+    "projects": [],
+    "volunteer": [],
+    "awards": [],
+    "certificates": [],
+    "publications": [],
+    "languages": [],
+    "interests": []
+}
+
+# System prompt for resume extraction; the resume text is sent as the user message.
+RESUME_PARSER_PROMPT = """
+You are an expert resume parser. Extract the following information from the resume text sent by the user and return it as a structured JSON object.
+If any section is not found, include it with empty values but maintain the structure.
+
+Please extract and structure the information into this exact JSON format:
+{
+    "basics": {
+        "name": "",
+        "email": "",
+        "phone": "",
+        "location": "",
+        "website": "",
+        "linkedin": "",
+        "summary": ""
+    },
+    "work": [
+        {
+            "company": "",
+            "position": "",
+            "startDate": "",
+            "endDate": "",
+            "description": "",
+            "highlights": []
+        }
+    ],
+    "education": [
+        {
+            "institution": "",
+            "degree": "",
+            "field": "",
+            "startDate": "",
+            "endDate": "",
+            "gpa": "",
+            "description": ""
+        }
+    ],
+    "skills": {
+        "technical": [],
+        "professional": [],
+        "languages_programming": [],
+        "tools": []
+    },
+    "projects": [
+        {
+            "name": "",
+            "description": "",
+            "technologies": [],
+            "startDate": "",
+            "endDate": "",
+            "url": "",
+            "highlights": []
+        }
+    ],
+    "volunteer": [
+        {
+            "organization": "",
+            "position": "",
+            "startDate": "",
+            "endDate": "",
+            "description": "",
+            "highlights": []
+        }
+    ],
+    "awards": [
+        {
+            "title": "",
+            "date": "",
+            "awarder": "",
+            "description": ""
+        }
+    ],
+    "certificates": [
+        {
+            "name": "",
+            "issuer": "",
+            "date": "",
+            "url": "",
+            "description": ""
+        }
+    ],
+    "publications": [
+        {
+            "title": "",
+            "publisher": "",
+            "date": "",
+            "url": "",
+            "description": ""
+        }
+    ],
+    "languages": [
+        {
+            "language": "",
+            "fluency": ""
+        }
+    ],
+    "interests": [
+        {
+            "name": "",
+            "keywords": []
+        }
+    ]
+}
+
+Instructions:
+1. Extract all available information accurately
+2. Use consistent date formats (YYYY-MM or YYYY-MM-DD)
+3. For arrays, include all relevant items found
+4. If information is not available, use empty strings or empty arrays
+5. Be thorough in extracting highlights and descriptions
+6. Return ONLY the JSON object, no additional text
+"""
+
+def run_mistral(api_key, func, *args):
+    """
+    Runs one of the async Mistral helpers to completion from synchronous Streamlit code.
+
+    asyncio.run creates a new event loop per call and an async connection pool
+    can't outlive its loop, so each call opens (and closes) its own client.
+
+    Args:
+        api_key (str): Mistral API key.
+        func (coroutine function): Helper taking the client as its first argument.
+        *args: Remaining arguments for func.
+
+    Returns:
+        The result of func.
+    """
+    async def run():
+        async with Mistral(api_key=api_key) as client:
+            return await func(client, *args)
+    
+    return asyncio.run(run())
+
+def hash_file(fileobj):
+    """
+    Computes the SHA-256 of a binary file object in fixed-size chunks.
+
+    Args:
+        fileobj (file-like): Binary file object; it is rewound before and after hashing.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    while chunk := fileobj.read(FILE_COPY_CHUNK_SIZE):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+async def upload_pdf(client, content, filename):
     """
     Uploads a PDF to Mistral's API and retrieves a signed URL for processing.
     
@@ -22,43 +220,61 @@ def upload_pdf(client, content, filename):
     Returns:
         str: Signed URL for the uploaded PDF.
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = os.path.join(temp_dir, filename)
-        
-        with open(temp_path, "wb") as tmp:
-            tmp.write(content)
-        
-        try:
-            with open(temp_path, "rb") as file_obj:
-                file_upload = client.files.upload(
-                    file={"file_name": filename, "content": file_obj},
-                    purpose="ocr"
-                )
-            
-            signed_url = client.files.get_signed_url(file_id=file_upload.id)
-            return signed_url.url
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+    file_upload = await client.files.upload_async(
+        file={"file_name": filename, "content": content},
+        purpose="ocr"
+    )
+    
+    signed_url = await client.files.get_signed_url_async(file_id=file_upload.id)
+    return signed_url.url
+
+def encode_image(uploaded_image):
+    """
+    Encodes an uploaded image as a JPEG data URL for OCR.
+
+    JPEG uploads within MAX_IMAGE_DIMENSION are passed through as-is; anything
+    else is downscaled and re-encoded as JPEG.
+
+    Args:
+        uploaded_image (UploadedFile): The uploaded image file.
+
+    Returns:
+        str: Base64 data URL of the image.
+    """
+    uploaded_image.seek(0)
+    image = Image.open(uploaded_image)
+    
+    if uploaded_image.type in ("image/jpeg", "image/jpg") and max(image.size) <= MAX_IMAGE_DIMENSION:
+        buffered = uploaded_image
+    else:
+        buffered = io.BytesIO()
+        image.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), Image.LANCZOS)
+        image.convert("RGB").save(buffered, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    
+    # Encode straight from the buffer's memory rather than a getvalue() copy
+    with buffered.getbuffer() as image_bytes:
+        img_str = base64.b64encode(image_bytes).decode("ascii")
+    return f"data:image/jpeg;base64,{img_str}"
 
-def process_ocr(client, document_source):
+async def process_ocr(client, document_source, include_images=False):
     """
     Processes a document using Mistral's OCR API.
 
     Args:
         client (Mistral): Mistral API client instance.
         document_source (dict): The source of the document (URL or image).
+        include_images (bool): Whether to return base64 images extracted from the pages.
 
     Returns:
         OCRResponse: The response from Mistral's OCR API.
     """
-    return client.ocr.process(
+    return await client.ocr.process_async(
         model="mistral-ocr-latest",
         document=document_source,
-        include_image_base64=True
+        include_image_base64=include_images
     )
 
-def extract_resume_data(client, extracted_text):
+async def extract_resume_data(client, extracted_text):
     """
     Uses Mistral AI to extract structured resume data from the extracted text.
     
@@ -68,184 +284,167 @@ def extract_resume_data(client, extracted_text):
     
     Returns:
         dict: Structured resume data in JSON format.
-    """
     
-    prompt = f"""
-    You are an expert resume parser. Extract the following information from this resume text and return it as a structured JSON object. 
-    If any section is not found, include it with empty values but maintain the structure.
+    Raises:
+        Exception: If the API call fails or the response is not valid JSON.
+    """
+    response = await client.chat.complete_async(
+        model="mistral-large-latest",
+        messages=[
+            {
+                "role": "system",
+                "content": RESUME_PARSER_PROMPT
+            },
+            {
+                "role": "user",
+                "content": extracted_text
+            }
+        ],
+        response_format={"type": "json_object"},
+        temperature=0.1,
+        max_tokens=4000
+    )
     
-    Resume text:
-    {extracted_text}
+    # JSON mode returns the bare object, so no markdown fences to strip
+    return json.loads(response.choices[0].message.content)
+
+def build_resume_json(resume_data, content_type, filename, total_pages):
+    """
+    Wraps extracted resume data with extraction metadata.
+
+    Args:
+        resume_data (dict): Structured resume data.
+        content_type (str): Input type ("pdf", "image" or "url").
+        filename (str): Name of the source document without extension.
+        total_pages (int): Number of pages returned by OCR.
+
+    Returns:
+        dict: Resume JSON with "metadata" and "resume" keys.
+    """
+    return {
+        "metadata": {
+            "extraction_timestamp": datetime.now().isoformat(),
+            "input_type": content_type,
+            "filename": filename,
+            "total_pages": total_pages,
+            "processor": "Mistral AI Resume Parser"
+        },
+        "resume": resume_data
+    }
+
+async def parse_resume_async(client, uploaded_file, semaphore):
+    """
+    Runs upload, OCR and extraction for one file of a batch.
+
+    Args:
+        client (Mistral): Mistral API client instance.
+        uploaded_file (UploadedFile): The uploaded PDF or image file.
+        semaphore (asyncio.Semaphore): Limits how many files are in flight at once.
+
+    Returns:
+        dict: Resume JSON with "metadata" and "resume" keys.
+    """
+    filename = uploaded_file.name.rsplit('.', 1)[0]
     
-    Please extract and structure the information into this exact JSON format:
-    {{
-        "basics": {{
-            "name": "",
-            "email": "",
-            "phone": "",
-            "location": "",
-            "website": "",
-            "linkedin": "",
-            "summary": ""
-        }},
-        "work": [
-            {{
-                "company": "",
-                "position": "",
-                "startDate": "",
-                "endDate": "",
-                "description": "",
-                "highlights": []
-            }}
-        ],
-        "education": [
-            {{
-                "institution": "",
-                "degree": "",
-                "field": "",
-                "startDate": "",
-                "endDate": "",
-                "gpa": "",
-                "description": ""
-            }}
-        ],
-        "skills": {{
-            "technical": [],
-            "professional": [],
-            "languages_programming": [],
-            "tools": []
-        }},
-        "projects": [
-            {{
-                "name": "",
-                "description": "",
-                "technologies": [],
-                "startDate": "",
-                "endDate": "",
-                "url": "",
-                "highlights": []
-            }}
-        ],
-        "volunteer": [
-            {{
-                "organization": "",
-                "position": "",
-                "startDate": "",
-                "endDate": "",
-                "description": "",
-                "highlights": []
-            }}
-        ],
-        "awards": [
-            {{
-                "title": "",
-                "date": "",
-                "awarder": "",
-                "description": ""
-            }}
-        ],
-        "certificates": [
-            {{
-                "name": "",
-                "issuer": "",
-                "date": "",
-                "url": "",
-                "description": ""
-            }}
-        ],
-        "publications": [
-            {{
-                "title": "",
-                "publisher": "",
-                "date": "",
-                "url": "",
-                "description": ""
-            }}
-        ],
-        "languages": [
-            {{
-                "language": "",
-                "fluency": ""
-            }}
-        ],
-        "interests": [
-            {{
-                "name": "",
-                "keywords": []
-            }}
-        ]
-    }}
-    
-    Instructions:
-    1. Extract all available information accurately
-    2. Use consistent date formats (YYYY-MM or YYYY-MM-DD)
-    3. For arrays, include all relevant items found
-    4. If information is not available, use empty strings or empty arrays
-    5. Be thorough in extracting highlights and descriptions
-    6. Return ONLY the JSON object, no additional text
-    """
-    
-    try:
-        response = client.chat.complete(
-            model="mistral-large-latest",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.1,
-            max_tokens=4000
-        )
-        
-        # Extract JSON from response
-        response_text = response.choices[0].message.content.strip()
+    async with semaphore:
+        if uploaded_file.name.lower().endswith(".pdf"):
+            document_source = {
+                "type": "document_url",
+                "document_url": await upload_pdf(client, uploaded_file.getvalue(), uploaded_file.name)
+            }
+            content_type = "pdf"
+        else:
+            document_source = {
+                "type": "image_url",
+                # Base64 encoding is CPU-bound, so keep it off the event loop
+                "image_url": await asyncio.to_thread(encode_image, uploaded_file)
+            }
+            content_type = "image"
         
-        # Try to parse JSON, handling potential markdown formatting
-        if response_text.startswith("```json"):
-            response_text = response_text.replace("```json", "").replace("```", "").strip()
-        elif response_text.startswith("```"):
-            response_text = response_text.replace("```", "").strip()
-            
-        return json.loads(response_text)
+        ocr_response = await process_ocr(client, document_source)
+        if not ocr_response or not ocr_response.pages:
+            raise ValueError("No content could be extracted from the document.")
         
-    except Exception as e:
-        st.error(f"Error extracting resume data: {str(e)}")
-        return create_empty_resume_structure()
+        extracted_text = "\n\n".join([page.markdown for page in ocr_response.pages])
+        resume_data = await extract_resume_data(client, extracted_text)
+    
+    return build_resume_json(resume_data, content_type, filename, len(ocr_response.pages))
+
+async def parse_resumes_async(api_key, uploaded_files):
+    """
+    Parses several resumes concurrently, at most BATCH_CONCURRENCY at a time.
+
+    A dedicated client is used so its async connection pool belongs to the
+    event loop created for this batch.
+
+    Args:
+        api_key (str): Mistral API key.
+        uploaded_files (list): Uploaded PDF or image files.
+
+    Returns:
+        list: Resume JSON dict or exception for each file, in upload order.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    async with Mistral(api_key=api_key) as client:
+        return await asyncio.gather(
+            *(parse_resume_async(client, uploaded_file, semaphore) for uploaded_file in uploaded_files),
+            return_exceptions=True
+        )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_process_ocr(_api_key, source_hash, _document_source):
+    """
+    Cached wrapper around process_ocr so Streamlit reruns don't repeat the API call.
+
+    Args:
+        _api_key (str): Mistral API key (not hashed).
+        source_hash (str): SHA-256 of the uploaded bytes or URL, used as the cache key.
+        _document_source (dict): The source of the document (not hashed, since
+            uploaded PDFs get a fresh signed URL on every upload).
+
+    Returns:
+        OCRResponse: The response from Mistral's OCR API.
+    """
+    return run_mistral(_api_key, process_ocr, _document_source)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_extract_resume_data(_api_key, text_hash, _extracted_text):
+    """
+    Cached wrapper around extract_resume_data keyed on the extracted text.
+
+    Only successful extractions are cached: failures raise, and st.cache_data
+    does not store exceptions, so the next rerun retries the call.
+
+    Args:
+        _api_key (str): Mistral API key (not hashed).
+        text_hash (str): SHA-256 of the extracted text, used as the cache key.
+        _extracted_text (str): The extracted text from the resume (not hashed).
+
+    Returns:
+        dict: Structured resume data in JSON format.
+    """
+    return run_mistral(_api_key, extract_resume_data, _extracted_text)
 
 def create_empty_resume_structure():
     """
     Creates an empty resume structure with all required fields.
     
     Returns:
-        dict: Empty resume structure.
+        dict: Empty resume structure (a fresh copy of EMPTY_RESUME).
     """
-    return {
-        "basics": {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "location": "",
-            "website": "",
-            "linkedin": "",
-            "summary": ""
-        },
-        "work": [],
-        "education": [],
-        "skills": {
-            "technical": [],
-            "professional": [],
-            "languages_programming": [],
-            "tools": []
-        },
-        "projects": [],
-        "volunteer": [],
-        "awards": [],
-        "certificates": [],
-        "publications": [],
-        "languages": [],
-        "interests": [],
-    }
+    return copy.deepcopy(EMPTY_RESUME)
+
+def count_words(text):
+    """
+    Counts whitespace-separated words without building a list of tokens.
+
+    Args:
+        text (str): Text to count words in.
+
+    Returns:
+        int: Number of words.
+    """
+    return sum(1 for _ in WORD_RE.finditer(text)) if text else 0
 
 def display_pdf(file):
     """
@@ -254,17 +453,52 @@ def display_pdf(file):
     Args:
         file (str): Path to the PDF file.
     """
+    # Encode in chunks that are a multiple of 3 bytes so no padding is emitted
+    # mid-stream, writing into a buffer pre-sized to the final base64 length.
+    size = os.path.getsize(file)
+    encoded = bytearray((size + 2) // 3 * 4)
+    offset = 0
     with open(file, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode("utf-8")
-        pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-        st.markdown(pdf_display, unsafe_allow_html=True)
+        while chunk := f.read(PDF_ENCODE_CHUNK_SIZE):
+            encoded_chunk = base64.b64encode(chunk)
+            encoded[offset:offset + len(encoded_chunk)] = encoded_chunk
+            offset += len(encoded_chunk)
+    base64_pdf = encoded.decode("ascii")
+    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
+    st.markdown(pdf_display, unsafe_allow_html=True)
+
+def compute_resume_stats(resume_data):
+    """
+    Counts the entries of every resume section in a single pass.
+    
+    Args:
+        resume_data (dict): Structured resume data.
+    
+    Returns:
+        dict: Entry count per section name, plus "total_skills",
+            "skill_categories" and "sections_found".
+    """
+    stats = {"total_skills": 0, "skill_categories": 0, "sections_found": 0}
+    for key, value in resume_data.items():
+        if key == "basics":
+            continue
+        if value:
+            stats["sections_found"] += 1
+        if key == "skills":
+            for skills in (value or {}).values():
+                stats["total_skills"] += len(skills)
+                stats["skill_categories"] += 1 if skills else 0
+        else:
+            stats[key] = len(value) if value else 0
+    return stats
 
-def display_resume_summary(resume_data):
+def display_resume_summary(resume_data, stats):
     """
     Displays a summary of the extracted resume data.
     
     Args:
         resume_data (dict): Structured resume data.
+        stats (dict): Section counts from compute_resume_stats.
     """
     st.subheader("📋 Resume Summary")
     
@@ -277,63 +511,67 @@ def display_resume_summary(resume_data):
         st.write(f"**Phone:** {resume_data['basics']['phone']}")
     
     # Work Experience
-    if resume_data["work"]:
-        st.write(f"**Work Experience:** {len(resume_data['work'])} positions")
+    if stats.get("work"):
+        st.write(f"**Work Experience:** {stats['work']} positions")
     
     # Education
-    if resume_data["education"]:
-        st.write(f"**Education:** {len(resume_data['education'])} entries")
+    if stats.get("education"):
+        st.write(f"**Education:** {stats['education']} entries")
     
     # Skills
-    total_skills = (len(resume_data["skills"]["technical"]) + 
-                   len(resume_data["skills"]["professional"]) + 
-                   len(resume_data["skills"]["languages_programming"]) + 
-                   len(resume_data["skills"]["tools"]))
-    if total_skills > 0:
-        st.write(f"**Skills:** {total_skills} total skills")
+    if stats["total_skills"] > 0:
+        st.write(f"**Skills:** {stats['total_skills']} total skills")
     
     # Projects
-    if resume_data["projects"]:
-        st.write(f"**Projects:** {len(resume_data['projects'])} projects")
+    if stats.get("projects"):
+        st.write(f"**Projects:** {stats['projects']} projects")
     
     # Other sections
     sections = ["volunteer", "awards", "certificates", "publications", "languages", "interests"]
     for section in sections:
-        if resume_data[section]:
-            st.write(f"**{section.title()}:** {len(resume_data[section])} entries")
+        if stats.get(section):
+            st.write(f"**{section.title()}:** {stats[section]} entries")
 
-def create_empty_resume_structure():
+def run_batch_mode(api_key):
     """
-    Creates an empty resume structure with all required fields.
+    Parses several uploaded resumes concurrently and shows the results.
     
-    Returns:
-        dict: Empty resume structure.
+    Args:
+        api_key (str): Mistral API key.
     """
-    return {
-        "basics": {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "location": "",
-            "website": "",
-            "linkedin": "",
-            "summary": ""
-        },
-        "work": [],
-        "education": [],
-        "skills": {
-            "technical": [],
-            "professional": [],
-            "languages_programming": [],
-            "tools": []
-        },
-        "projects": [],
-        "volunteer": [],
-        "awards": [],
-        "certificates": [],
-        "publications": [],
-        "languages": [],
-    }
+    uploaded_files = st.file_uploader(
+        "Choose resume files", type=["pdf", "png", "jpg", "jpeg"], accept_multiple_files=True
+    )
+    if not uploaded_files:
+        st.info("👆 Please upload one or more resume files to get started.")
+        return
+    
+    # Keep results in session state so reruns (e.g. download clicks) don't re-parse
+    batch_key = tuple(hash_file(uploaded_file) for uploaded_file in uploaded_files)
+    if st.session_state.get("batch_key") != batch_key:
+        with st.spinner(f"🔄 Processing {len(uploaded_files)} resumes..."):
+            st.session_state["batch_results"] = asyncio.run(parse_resumes_async(api_key, uploaded_files))
+        st.session_state["batch_key"] = batch_key
+    
+    results = st.session_state["batch_results"]
+    parsed = [result for result in results if not isinstance(result, Exception)]
+    st.success(f"✅ Processed {len(parsed)} of {len(results)} resumes")
+    
+    for uploaded_file, result in zip(uploaded_files, results):
+        if isinstance(result, Exception):
+            st.error(f"{uploaded_file.name}: Processing error: {str(result)}")
+            continue
+        with st.expander(uploaded_file.name):
+            display_resume_summary(result["resume"], compute_resume_stats(result["resume"]))
+    
+    if parsed:
+        st.download_button(
+            label="📥 Download All Resumes JSON",
+            data=json.dumps(parsed, ensure_ascii=False, separators=(",", ":")),
+            file_name="resumes_parsed.json",
+            mime="application/json",
+            type="primary"
+        )
 
 def main():
     """
@@ -349,17 +587,19 @@ def main():
         st.error("API key not found. Please set API_KEY_NAME in your environment variables.")
         st.stop()
     
-    # Initialize Mistral API client
-    client = Mistral(api_key=api_key)
-    
     # Main app interface
     st.title("AI Resume Parser")
     st.markdown("Upload a resume (PDF or image) and get structured JSON data automatically!")
     
     # Input method selection
-    input_method = st.radio("Select Input Type:", ["PDF Upload", "Image Upload", "URL"], horizontal=True)
+    input_method = st.radio("Select Input Type:", ["PDF Upload", "Image Upload", "URL", "Batch Upload"], horizontal=True)
+    
+    if input_method == "Batch Upload":
+        run_batch_mode(api_key)
+        return
     
     document_source = None
+    source_hash = None
     content_type = None
     filename = None
     
@@ -370,27 +610,41 @@ def main():
                 "type": "document_url",
                 "document_url": url
             }
+            source_hash = hashlib.sha256(url.encode()).hexdigest()
             content_type = "url"
             filename = "resume_from_url"
     
     elif input_method == "PDF Upload":
         uploaded_file = st.file_uploader("Choose PDF file", type=["pdf"])
         if uploaded_file:
-            content = uploaded_file.read()
+            source_hash = hash_file(uploaded_file)
             filename = uploaded_file.name.replace('.pdf', '')
             
-            # Display the uploaded PDF
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(content)
-                pdf_path = tmp.name
-            
-            with st.expander("View Uploaded PDF"):
-                display_pdf(pdf_path)
+            # Display the uploaded PDF only when requested, so reruns skip the base64 encoding
+            if st.checkbox("View Uploaded PDF", key="show_pdf"):
+                uploaded_file.seek(0)
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                    shutil.copyfileobj(uploaded_file, tmp, length=FILE_COPY_CHUNK_SIZE)
+                    pdf_path = tmp.name
+                try:
+                    display_pdf(pdf_path)
+                finally:
+                    os.remove(pdf_path)
             
-            # Prepare document source for OCR processing
+            # Prepare document source for OCR processing, uploading each PDF once per session
+            signed_urls = st.session_state.setdefault("mistral_urls", {})
+            if source_hash not in signed_urls:
+                # The SDK rejects BytesIO (which UploadedFile is); getvalue() shares its buffer
+                try:
+                    signed_urls[source_hash] = run_mistral(
+                        api_key, upload_pdf, uploaded_file.getvalue(), uploaded_file.name
+                    )
+                except Exception as e:
+                    st.error(f"PDF upload error: {str(e)}")
+                    st.stop()
             document_source = {
                 "type": "document_url",
-                "document_url": upload_pdf(client, content, uploaded_file.name)
+                "document_url": signed_urls[source_hash]
             }
             content_type = "pdf"
     
@@ -398,20 +652,16 @@ def main():
         uploaded_image = st.file_uploader("Choose Image file", type=["png", "jpg", "jpeg"])
         if uploaded_image:
             filename = uploaded_image.name.rsplit('.', 1)[0]
+            source_hash = hash_file(uploaded_image)
             
             # Display the uploaded image
             image = Image.open(uploaded_image)
             st.image(image, caption="📷 Uploaded Resume Image", use_container_width=True)
             
-            # Convert image to base64
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            
             # Prepare document source for OCR processing
             document_source = {
                 "type": "image_url",
-                "image_url": f"data:image/png;base64,{img_str}"
+                "image_url": encode_image(uploaded_image)
             }
             content_type = "image"
     
@@ -421,7 +671,7 @@ def main():
             try:
                 # Step 1: Extract text using OCR
                 st.info("Step 1: Extracting text from document...")
-                ocr_response = process_ocr(client, document_source)
+                ocr_response = cached_process_ocr(api_key, source_hash, document_source)
                 
                 if ocr_response and ocr_response.pages:
                     # Combine extracted text from all pages
@@ -429,28 +679,25 @@ def main():
                     
                     # Step 2: Parse resume data using AI
                     st.info("Step 2: Analyzing and structuring resume data...")
-                    resume_data = extract_resume_data(client, extracted_text)
+                    text_hash = hashlib.sha256(extracted_text.encode()).hexdigest()
+                    try:
+                        resume_data = cached_extract_resume_data(api_key, text_hash, extracted_text)
+                    except Exception as e:
+                        st.error(f"Error extracting resume data: {str(e)}")
+                        resume_data = create_empty_resume_structure()
                     
                     # Add metadata
-                    resume_json = {
-                        "metadata": {
-                            "extraction_timestamp": datetime.now().isoformat(),
-                            "input_type": content_type,
-                            "filename": filename,
-                            "total_pages": len(ocr_response.pages),
-                            "processor": "Mistral AI Resume Parser"
-                        },
-                        "resume": resume_data
-                    }
+                    resume_json = build_resume_json(resume_data, content_type, filename, len(ocr_response.pages))
                     
                     # Display results
+                    resume_stats = compute_resume_stats(resume_data)
                     st.success("✅ Resume processed successfully!")
                     
                     # Create two columns for display
                     col1, col2 = st.columns([1, 1])
                     
                     with col1:
-                        display_resume_summary(resume_data)
+                        display_resume_summary(resume_data, resume_stats)
                     
                     with col2:
                         st.subheader("Download Options")
@@ -460,7 +707,7 @@ def main():
                         json_filename = f"{safe_filename}_parsed.json"
                         
                         # JSON download button
-                        json_content = json.dumps(resume_json, indent=2, ensure_ascii=False)
+                        json_content = json.dumps(resume_json, ensure_ascii=False, separators=(",", ":"))
                         st.download_button(
                             label="📥 Download Resume JSON",
                             data=json_content,
@@ -477,21 +724,21 @@ def main():
                             mime="text/plain"
                         )
                     
-                    # Show detailed JSON structure
-                    with st.expander("🔍 View Detailed JSON Structure"):
+                    # Show detailed JSON structure (only serialized for the browser when requested)
+                    if st.checkbox("🔍 View Detailed JSON Structure", key="show_resume_json"):
                         st.json(resume_json)
                     
                     # Show extraction statistics
                     with st.expander("Extraction Statistics"):
                         stats = {
-                            "Total sections found": len([k for k, v in resume_data.items() if v and k != "basics"]),
-                            "Work experiences": len(resume_data.get("work", [])),
-                            "Education entries": len(resume_data.get("education", [])),
-                            "Skills categories": len([k for k, v in resume_data.get("skills", {}).items() if v]),
-                            "Projects": len(resume_data.get("projects", [])),
-                            "Certificates": len(resume_data.get("certificates", [])),
-                            "Languages": len(resume_data.get("languages", [])),
-                            "Total words extracted": len(extracted_text.split())
+                            "Total sections found": resume_stats["sections_found"],
+                            "Work experiences": resume_stats.get("work", 0),
+                            "Education entries": resume_stats.get("education", 0),
+                            "Skills categories": resume_stats["skill_categories"],
+                            "Projects": resume_stats.get("projects", 0),
+                            "Certificates": resume_stats.get("certificates", 0),
+                            "Languages": resume_stats.get("languages", 0),
+                            "Total words extracted": count_words(extracted_text)
                         }
                         
                         for key, value in stats.items():
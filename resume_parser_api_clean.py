@@ -1,24 +1,397 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
-import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, get_origin
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+import asyncio
+import hashlib
+import httpx
+import logging
+import math
+import operator
 import os
-import json
+import re
+import time
+import orjson
 import base64
+import io
 from datetime import datetime
 from mistralai import Mistral
-from PIL import Image
-import io
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+API_KEY = os.environ.get("API_KEY_NAME")
+if not API_KEY:
+    raise ValueError("API_KEY_NAME environment variable is required")
+
+MISTRAL_API_URL = "https://api.mistral.ai"
+
+# MIME types for image uploads; Mistral OCR accepts these as data URLs as-is
+IMAGE_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg"
+}
+
+# System prompt for resume extraction (same as Streamlit app); the resume text is sent as the user message
+RESUME_PARSER_PROMPT = """
+You are an expert resume parser. Extract the following information from the resume text sent by the user and return it as a structured JSON object.
+If any section is not found, include it with empty values but maintain the structure.
+
+Please extract and structure the information into this exact JSON format:
+{
+    "basics": {
+        "name": "",
+        "email": "",
+        "phone": "",
+        "location": "",
+        "website": "",
+        "linkedin": "",
+        "summary": ""
+    },
+    "work": [
+        {
+            "company": "",
+            "position": "",
+            "startDate": "",
+            "endDate": "",
+            "description": "",
+            "highlights": []
+        }
+    ],
+    "education": [
+        {
+            "institution": "",
+            "degree": "",
+            "field": "",
+            "startDate": "",
+            "endDate": "",
+            "gpa": "",
+            "description": ""
+        }
+    ],
+    "skills": {
+        "technical": [],
+        "professional": [],
+        "languages_programming": [],
+        "tools": []
+    },
+    "projects": [
+        {
+            "name": "",
+            "description": "",
+            "technologies": [],
+            "startDate": "",
+            "endDate": "",
+            "url": "",
+            "highlights": []
+        }
+    ],
+    "volunteer": [
+        {
+            "organization": "",
+            "position": "",
+            "startDate": "",
+            "endDate": "",
+            "description": "",
+            "highlights": []
+        }
+    ],
+    "awards": [
+        {
+            "title": "",
+            "date": "",
+            "awarder": "",
+            "description": ""
+        }
+    ],
+    "certificates": [
+        {
+            "name": "",
+            "issuer": "",
+            "date": "",
+            "url": "",
+            "description": ""
+        }
+    ],
+    "publications": [
+        {
+            "title": "",
+            "publisher": "",
+            "date": "",
+            "url": "",
+            "description": ""
+        }
+    ],
+    "languages": [
+        {
+            "language": "",
+            "fluency": ""
+        }
+    ],
+    "interests": [
+        {
+            "name": "",
+            "keywords": []
+        }
+    ],
+    "references": [
+        {
+            "name": "",
+            "position": "",
+            "company": "",
+            "email": "",
+            "phone": "",
+            "relationship": ""
+        }
+    ]
+}
+
+Instructions:
+1. Extract all available information accurately
+2. Use consistent date formats (YYYY-MM or YYYY-MM-DD)
+3. For arrays, include all relevant items found
+4. If information is not available, use empty strings or empty arrays
+5. Be thorough in extracting highlights and descriptions
+6. Return ONLY the JSON object, no additional text
+"""
+
+# Template returned when resume extraction fails; shared and read-only (callers
+# check for it by identity), so copy it before mutating
+EMPTY_RESUME = {
+    "basics": {
+        "name": "",
+        "email": "",
+        "phone": "",
+        "location": "",
+        "website": "",
+        "linkedin": "",
+        "summary": ""
+    },
+    "work": [],
+    "education": [],
+    "skills": {
+        "technical": [],
+        "professional": [],
+        "languages_programming": [],
+        "tools": []
+    },
+    "projects": [],
+    "volunteer": [],
+    "awards": [],
+    "certificates": [],
+    "publications": [],
+    "languages": [],
+    "interests": [],
+    "references": []
+}
+
+# Prompt for the cheap follow-up call that fixes malformed or truncated extraction output
+RESUME_REPAIR_PROMPT = """
+The user message describes a problem with a resume JSON object, followed by that JSON. It may be
+malformed, cut off, or not match the expected structure. Fix the problem and return a single valid
+JSON object with the same structure, keeping all of the information it contains. Return ONLY the JSON object.
+"""
+
+class ResumeSchemaModel(BaseModel):
+    """Base for the resume schema models; numbers are accepted where text is expected."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def coerce_empty_values(cls, value, info):
+        """Treat null as the field's empty default and a comma-separated string as a list."""
+        field = cls.model_fields[info.field_name]
+        if value is None:
+            return field.get_default(call_default_factory=True)
+        if isinstance(value, str) and get_origin(field.annotation) is list:
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+class Basics(ResumeSchemaModel):
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    website: str = ""
+    linkedin: str = ""
+    summary: str = ""
+
+class Work(ResumeSchemaModel):
+    company: str = ""
+    position: str = ""
+    startDate: str = ""
+    endDate: str = ""
+    description: str = ""
+    highlights: List[str] = []
+
+class Education(ResumeSchemaModel):
+    institution: str = ""
+    degree: str = ""
+    field: str = ""
+    startDate: str = ""
+    endDate: str = ""
+    gpa: str = ""
+    description: str = ""
+
+class Skills(ResumeSchemaModel):
+    technical: List[str] = []
+    professional: List[str] = []
+    languages_programming: List[str] = []
+    tools: List[str] = []
+
+class Project(ResumeSchemaModel):
+    name: str = ""
+    description: str = ""
+    technologies: List[str] = []
+    startDate: str = ""
+    endDate: str = ""
+    url: str = ""
+    highlights: List[str] = []
+
+class Volunteer(ResumeSchemaModel):
+    organization: str = ""
+    position: str = ""
+    startDate: str = ""
+    endDate: str = ""
+    description: str = ""
+    highlights: List[str] = []
+
+class Award(ResumeSchemaModel):
+    title: str = ""
+    date: str = ""
+    awarder: str = ""
+    description: str = ""
+
+class Certificate(ResumeSchemaModel):
+    name: str = ""
+    issuer: str = ""
+    date: str = ""
+    url: str = ""
+    description: str = ""
+
+class Publication(ResumeSchemaModel):
+    title: str = ""
+    publisher: str = ""
+    date: str = ""
+    url: str = ""
+    description: str = ""
+
+class Language(ResumeSchemaModel):
+    language: str = ""
+    fluency: str = ""
+
+class Interest(ResumeSchemaModel):
+    name: str = ""
+    keywords: List[str] = []
+
+class Reference(ResumeSchemaModel):
+    name: str = ""
+    position: str = ""
+    company: str = ""
+    email: str = ""
+    phone: str = ""
+    relationship: str = ""
+
+class ResumeModel(ResumeSchemaModel):
+    """Resume structure requested in RESUME_PARSER_PROMPT, used to validate LLM output."""
+    basics: Basics = Basics()
+    work: List[Work] = []
+    education: List[Education] = []
+    skills: Skills = Skills()
+    projects: List[Project] = []
+    volunteer: List[Volunteer] = []
+    awards: List[Award] = []
+    certificates: List[Certificate] = []
+    publications: List[Publication] = []
+    languages: List[Language] = []
+    interests: List[Interest] = []
+    references: List[Reference] = []
+
+# OCR text shorter than this, or without an email address or phone number, is not sent to the LLM
+MIN_RESUME_TEXT_LENGTH = 50
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# Digit groups joined by single separators; candidates need MIN_PHONE_DIGITS digits,
+# so date ranges like "2019-2023" or "2019 - 2023" don't count as phone numbers
+PHONE_RE = re.compile(r"(?<![\d-])\+?(?:\(\d{1,4}\)[\s.-]?)?\d{1,15}(?:[\s.-]\d{1,4}){0,5}(?![\d-])")
+MIN_PHONE_DIGITS = 9
+
+# Read size used when hashing uploads
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Uvicorn worker processes; the app is I/O-bound and async, so a few workers suffice
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+# Upper bound on resumes going through the Mistral pipeline at once across all
+# workers; each process gets an equal share of the budget
+MAX_IN_FLIGHT = max(1, int(os.environ.get("MAX_IN_FLIGHT", "32")) // WEB_CONCURRENCY)
+mistral_semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+# Exact-match cache of parse results, keyed by a hash of the uploaded bytes
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "3600"))
+result_cache = OrderedDict()
+
+# Semantic cache over extract_resume_data, reusing the structured data of a
+# near-duplicate OCR text. Off unless SEMANTIC_CACHE_THRESHOLD (cosine
+# similarity, e.g. 0.92) is set, since a false hit returns another resume's data.
+SEMANTIC_CACHE_THRESHOLD = (
+    float(os.environ["SEMANTIC_CACHE_THRESHOLD"]) if os.environ.get("SEMANTIC_CACHE_THRESHOLD") else None
+)
+SEMANTIC_CACHE_SIZE = int(os.environ.get("SEMANTIC_CACHE_SIZE", "512"))
+EMBED_TEXT_LIMIT = 8000
+semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Create the Mistral client once per process and share it across requests."""
+    # One long-lived connection pool for every Mistral call, sized well above
+    # httpx's default of 100 connections; follow_redirects matches the SDK's own default client
+    app.state.http = httpx.AsyncClient(
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=1024, max_keepalive_connections=512),
+        timeout=httpx.Timeout(120)
+    )
+    app.state.mistral = Mistral(api_key=API_KEY, async_client=app.state.http)
+    
+    # Dedicated pool for CPU-bound work (image encoding, semantic cache scans) so it
+    # can't starve the default thread pool
+    app.state.cpu_pool = ThreadPoolExecutor(
+        max_workers=min(8, os.cpu_count() or 2),
+        thread_name_prefix="cpu-work"
+    )
+    
+    # Open a keep-alive connection up front so the first request skips the TLS handshake
+    try:
+        await app.state.http.head(MISTRAL_API_URL, timeout=5)
+    except httpx.HTTPError as e:
+        logger.warning("Mistral connection pre-warm failed: %s", e)
+    
+    yield
+    
+    app.state.cpu_pool.shutdown(wait=False)
+    await app.state.http.aclose()
+
+class OrjsonResponse(JSONResponse):
+    """JSON response serialized with orjson, which is several times faster than the stdlib encoder."""
+    
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 app = FastAPI(
     title="AI Resume Parser API",
     description="Upload resume files (PDF/Image) and get structured JSON data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse
 )
 
 # Add CORS middleware
@@ -30,258 +403,179 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Mistral client
-API_KEY = os.environ.get("API_KEY_NAME")
-if not API_KEY:
-    raise ValueError("API_KEY_NAME environment variable is required")
-
-client = Mistral(api_key=API_KEY)
-
-def upload_pdf_to_mistral(content, filename):
+async def upload_pdf_to_mistral(client, fileobj, filename):
     """Upload PDF to Mistral's API and get signed URL - matches Streamlit app exactly."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = os.path.join(temp_dir, filename)
-        
-        with open(temp_path, "wb") as tmp:
-            tmp.write(content)
+    try:
+        # Stream the file object directly, no temp file round-trip
+        file_upload = await client.files.upload_async(
+            file={"file_name": filename, "content": fileobj},
+            purpose="ocr"
+        )
         
-        try:
-            with open(temp_path, "rb") as file_obj:
-                # Use exact same format as working Streamlit app
-                file_upload = client.files.upload(
-                    file={"file_name": filename, "content": file_obj},
-                    purpose="ocr"
-                )
-            
-            signed_url = client.files.get_signed_url(file_id=file_upload.id)
-            return signed_url.url
-        except Exception as e:
-            print(f"PDF upload error: {str(e)}")
-            print(f"Error type: {type(e)}")
-            # Let's see what the actual error is
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
-            raise Exception(f"Failed to upload PDF: {str(e)}")
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-
-def process_ocr(document_source):
-    """Process document using Mistral's OCR API."""
-    return client.ocr.process(
+        signed_url = await client.files.get_signed_url_async(file_id=file_upload.id)
+        return signed_url.url
+    except Exception as e:
+        raise Exception(f"Failed to upload PDF: {str(e)}") from e
+
+async def process_ocr(client, document_source, include_images=False):
+    """Process document using Mistral's OCR API (page images are only returned on request)."""
+    return await client.ocr.process_async(
         model="mistral-ocr-latest",
         document=document_source,
-        include_image_base64=True
+        include_image_base64=include_images
     )
 
-def extract_resume_data(extracted_text):
-    """Extract structured resume data using Mistral AI - matches Streamlit app exactly."""
-    
-    prompt = f"""
-    You are an expert resume parser. Extract the following information from this resume text and return it as a structured JSON object. 
-    If any section is not found, include it with empty values but maintain the structure.
-    
-    Resume text:
-    {extracted_text}
-    
-    Please extract and structure the information into this exact JSON format:
-    {{
-        "basics": {{
-            "name": "",
-            "email": "",
-            "phone": "",
-            "location": "",
-            "website": "",
-            "linkedin": "",
-            "summary": ""
-        }},
-        "work": [
-            {{
-                "company": "",
-                "position": "",
-                "startDate": "",
-                "endDate": "",
-                "description": "",
-                "highlights": []
-            }}
-        ],
-        "education": [
-            {{
-                "institution": "",
-                "degree": "",
-                "field": "",
-                "startDate": "",
-                "endDate": "",
-                "gpa": "",
-                "description": ""
-            }}
-        ],
-        "skills": {{
-            "technical": [],
-            "professional": [],
-            "languages_programming": [],
-            "tools": []
-        }},
-        "projects": [
-            {{
-                "name": "",
-                "description": "",
-                "technologies": [],
-                "startDate": "",
-                "endDate": "",
-                "url": "",
-                "highlights": []
-            }}
-        ],
-        "volunteer": [
-            {{
-                "organization": "",
-                "position": "",
-                "startDate": "",
-                "endDate": "",
-                "description": "",
-                "highlights": []
-            }}
-        ],
-        "awards": [
-            {{
-                "title": "",
-                "date": "",
-                "awarder": "",
-                "description": ""
-            }}
-        ],
-        "certificates": [
-            {{
-                "name": "",
-                "issuer": "",
-                "date": "",
-                "url": "",
-                "description": ""
-            }}
-        ],
-        "publications": [
-            {{
-                "title": "",
-                "publisher": "",
-                "date": "",
-                "url": "",
-                "description": ""
-            }}
-        ],
-        "languages": [
-            {{
-                "language": "",
-                "fluency": ""
-            }}
-        ],
-        "interests": [
-            {{
-                "name": "",
-                "keywords": []
-            }}
-        ],
-        "references": [
-            {{
-                "name": "",
-                "position": "",
-                "company": "",
-                "email": "",
-                "phone": "",
-                "relationship": ""
-            }}
-        ]
-    }}
-    
-    Instructions:
-    1. Extract all available information accurately
-    2. Use consistent date formats (YYYY-MM or YYYY-MM-DD)
-    3. For arrays, include all relevant items found
-    4. If information is not available, use empty strings or empty arrays
-    5. Be thorough in extracting highlights and descriptions
-    6. Return ONLY the JSON object, no additional text
-    """
+def validate_resume(data):
+    """Validate parsed LLM output against ResumeModel; raises ValidationError if it doesn't fit."""
+    return ResumeModel.model_validate(data).model_dump()
+
+def salvage_resume(data):
+    """Keep the non-empty sections of off-schema LLM output that validate on their own; None if there are none."""
+    if not isinstance(data, dict):
+        return None
     
+    sections = {}
+    for name in ResumeModel.model_fields:
+        if not data.get(name):
+            continue
+        try:
+            sections[name] = getattr(ResumeModel.model_validate({name: data[name]}), name)
+        except ValidationError:
+            continue
+    return ResumeModel(**sections).model_dump() if sections else None
+
+def parse_resume_json(response_text):
+    """Parse and validate LLM output against ResumeModel; raises ValueError if it doesn't fit."""
+    return validate_resume(orjson.loads(response_text))
+
+async def extract_resume_data(client, extracted_text):
+    """Extract structured resume data using Mistral AI - matches Streamlit app exactly."""
     try:
-        response = client.chat.complete(
+        response = await client.chat.complete_async(
             model="mistral-large-latest",
             messages=[
+                {
+                    "role": "system",
+                    "content": RESUME_PARSER_PROMPT
+                },
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": extracted_text
                 }
             ],
+            response_format={"type": "json_object"},
             temperature=0.1,
             max_tokens=4000
         )
+        response_text = response.choices[0].message.content
         
-        # Extract JSON from response
-        response_text = response.choices[0].message.content.strip()
-        
-        # Clean up response text (same as Streamlit app)
-        if response_text.startswith("```json"):
-            response_text = response_text.replace("```json", "").replace("```", "").strip()
-        elif response_text.startswith("```"):
-            response_text = response_text.replace("```", "").strip()
-            
-        return json.loads(response_text)
+    except Exception:
+        logger.exception("Error extracting resume data")
+        return EMPTY_RESUME
+    
+    # JSON mode returns the bare object, so no markdown fences to strip
+    parsed = None
+    try:
+        parsed = orjson.loads(response_text)
+        return validate_resume(parsed)
+    except orjson.JSONDecodeError as e:
+        problem = f"The JSON is invalid: {e}"
+    except ValidationError as e:
+        problem = f"The JSON does not match the resume structure: {e}"
+    logger.warning("Invalid resume JSON, attempting repair: %s", problem)
+    
+    # Ask a cheaper model to fix the output rather than discarding the whole extraction
+    try:
+        repair = await client.chat.complete_async(
+            model="mistral-small-latest",
+            messages=[
+                {
+                    "role": "system",
+                    "content": RESUME_REPAIR_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": f"Problem: {problem}\n\nJSON:\n{response_text}"
+                }
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=4000
+        )
+        return parse_resume_json(repair.choices[0].message.content)
         
-    except Exception as e:
-        print(f"Error extracting resume data: {str(e)}")
-        return create_empty_resume_structure()
+    except Exception:
+        logger.exception("Error repairing resume data")
+    
+    # Keep the sections that do validate rather than dropping the extraction entirely;
+    # anything that never passed validation is replaced by its empty default
+    return salvage_resume(parsed) or EMPTY_RESUME
 
-def create_empty_resume_structure():
-    """Create empty resume structure - matches Streamlit app exactly."""
-    return {
-        "basics": {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "location": "",
-            "website": "",
-            "linkedin": "",
-            "summary": ""
-        },
-        "work": [],
-        "education": [],
-        "skills": {
-            "technical": [],
-            "professional": [],
-            "languages_programming": [],
-            "tools": []
-        },
-        "projects": [],
-        "volunteer": [],
-        "awards": [],
-        "certificates": [],
-        "publications": [],
-        "languages": [],
-        "interests": [],
-        "references": []
-    }
+def has_contact_details(text):
+    """Return True if text contains an email address or a phone number."""
+    if EMAIL_RE.search(text):
+        return True
+    return any(
+        sum(char.isdigit() for char in match.group()) >= MIN_PHONE_DIGITS
+        for match in PHONE_RE.finditer(text)
+    )
 
-@app.get("/")
-async def root():
-    """API information."""
-    return {
-        "message": "AI Resume Parser API",
-        "status": "active",
-        "version": "1.0.0",
-        "description": "Upload resume files (PDF/Image) and get structured JSON data - matches Streamlit app functionality",
-        "endpoints": {
-            "parse_resume": "/parse-resume (POST) - Upload resume file and get structured JSON",
-            "health": "/health (GET) - API health check"
-        }
-    }
+def looks_like_resume(text):
+    """Cheap check that OCR text is worth an extraction call: long enough and with contact details."""
+    return len(text.strip()) >= MIN_RESUME_TEXT_LENGTH and has_contact_details(text)
 
-@app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
+def encode_image(content, mime_type):
+    """Base64-encode image bytes into a data URL (blocking, run on the CPU pool)."""
+    img_str = base64.b64encode(content).decode()
+    return f"data:{mime_type};base64,{img_str}"
+
+def get_cached_result(key):
+    """Return the cached parse result for key, or None if missing or expired."""
+    entry = result_cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, result = entry
+    if time.monotonic() - stored_at > RESULT_CACHE_TTL:
+        del result_cache[key]
+        return None
+    
+    result_cache.move_to_end(key)
+    return result
+
+def cache_result(key, result):
+    """Store a parse result, evicting the least recently used entries past RESULT_CACHE_SIZE."""
+    result_cache[key] = (time.monotonic(), result)
+    result_cache.move_to_end(key)
+    while len(result_cache) > RESULT_CACHE_SIZE:
+        result_cache.popitem(last=False)
+
+async def embed_text(client, text):
+    """Embed OCR text with mistral-embed and return the L2-normalized vector."""
+    response = await client.embeddings.create_async(
+        model="mistral-embed",
+        inputs=[text[:EMBED_TEXT_LIMIT]]
+    )
+    vector = response.data[0].embedding
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+def find_similar_resume(embedding, entries):
+    """Return the resume data in entries most similar to embedding if it reaches the threshold (blocking, run on the CPU pool)."""
+    best_score, best_resume = SEMANTIC_CACHE_THRESHOLD, None
+    for cached_embedding, resume_data in entries:
+        score = sum(map(operator.mul, embedding, cached_embedding))
+        if score >= best_score:
+            best_score, best_resume = score, resume_data
+    return best_resume
+
+async def parse_resume_file(client, cpu_pool, file):
     """
-    Parse resume from uploaded file (PDF or Image).
-    Returns structured JSON with resume data - exactly like Streamlit app.
+    Run the full pipeline (cache lookup, upload, OCR, extraction) for one uploaded file.
+    Image encoding and the semantic cache scan run on cpu_pool. Returns the result dict; failures are raised as HTTPException.
     """
     try:
-        print(f"Processing file: {file.filename}")
+        logger.info("Processing file: %s", file.filename)
         
         # Validate file type
         allowed_extensions = ['.pdf', '.png', '.jpg', '.jpeg']
@@ -293,48 +587,95 @@ async def parse_resume(file: UploadFile = File(...)):
                 detail=f"Unsupported file extension: {file_extension}. Allowed: {', '.join(allowed_extensions)}"
             )
         
-        # Read file content
-        content = await file.read()
-        if not content:
+        # Hash the upload in chunks instead of reading it into one bytes object;
+        # Starlette has already spooled it to a temporary file
+        digest = hashlib.blake2b(digest_size=16)
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        if not size:
             raise HTTPException(status_code=422, detail="File appears to be empty")
+        await file.seek(0)
         
         filename = file.filename.rsplit('.', 1)[0] if '.' in file.filename else file.filename
         
-        # Determine file type and prepare document source
-        if file_extension == '.pdf':
-            print("Processing as PDF...")
-            document_url = upload_pdf_to_mistral(content, file.filename)
-            document_source = {
-                "type": "document_url",
-                "document_url": document_url
-            }
-            content_type = "pdf"
-        else:
-            print("Processing as Image...")
-            image = Image.open(io.BytesIO(content))
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            
-            document_source = {
-                "type": "image_url",
-                "image_url": f"data:image/png;base64,{img_str}"
+        # Return the stored result if these exact bytes were parsed recently
+        cache_key = digest.hexdigest()
+        cached = get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("Returning cached result...")
+            metadata = {
+                **cached["metadata"],
+                "extraction_timestamp": datetime.now().isoformat(),
+                "filename": filename
             }
-            content_type = "image"
+            return {**cached, "metadata": metadata}
         
-        # Step 1: Extract text using OCR (same as Streamlit app)
-        print("Step 1: Extracting text from document...")
-        ocr_response = process_ocr(document_source)
+        # Bound concurrent Mistral work to avoid rate-limit storms and memory blow-up
+        async with mistral_semaphore:
+            # Determine file type and prepare document source
+            if file_extension == '.pdf':
+                logger.info("Processing as PDF...")
+                # The SDK only accepts bytes or buffered readers; wrap the spooled file so it still streams
+                document_url = await upload_pdf_to_mistral(client, io.BufferedReader(file.file), file.filename)
+                document_source = {
+                    "type": "document_url",
+                    "document_url": document_url
+                }
+                content_type = "pdf"
+            else:
+                logger.info("Processing as Image...")
+                # Send the original bytes; base64 runs on the CPU pool to keep the event loop free
+                content = await file.read()
+                loop = asyncio.get_running_loop()
+                image_url = await loop.run_in_executor(
+                    cpu_pool, encode_image, content, IMAGE_MIME_TYPES[file_extension]
+                )
+                
+                document_source = {
+                    "type": "image_url",
+                    "image_url": image_url
+                }
+                content_type = "image"
+        
+            # Step 1: Extract text using OCR (same as Streamlit app)
+            logger.info("Step 1: Extracting text from document...")
+            ocr_response = await process_ocr(client, document_source)
         
-        if not ocr_response or not ocr_response.pages:
-            raise HTTPException(status_code=400, detail="No content could be extracted from the document")
+            if not ocr_response or not ocr_response.pages:
+                raise HTTPException(status_code=400, detail="No content could be extracted from the document")
         
-        # Combine extracted text from all pages (same as Streamlit app)
-        extracted_text = "\n\n".join([page.markdown for page in ocr_response.pages])
+            # Combine extracted text from all pages (same as Streamlit app)
+            extracted_text = "\n\n".join(page.markdown for page in ocr_response.pages)
         
-        # Step 2: Parse resume data using AI (same as Streamlit app)
-        print("Step 2: Analyzing and structuring resume data...")
-        resume_data = extract_resume_data(extracted_text)
+            # Skip the LLM entirely for blank or degenerate OCR output (wrong file, failed scan);
+            # otherwise reuse a near-duplicate's data when the semantic cache is on
+            short_circuited = not looks_like_resume(extracted_text)
+            resume_data = None
+            embedding = None
+            if short_circuited:
+                logger.info("Step 2: Skipped, OCR output is too short or has no contact details")
+                resume_data = EMPTY_RESUME
+            elif SEMANTIC_CACHE_THRESHOLD is not None:
+                try:
+                    embedding = await embed_text(client, extracted_text)
+                    # The scan is pure Python over the whole cache, so keep it off the event loop;
+                    # pass a snapshot since other requests append to the deque meanwhile
+                    resume_data = await asyncio.get_running_loop().run_in_executor(
+                        cpu_pool, find_similar_resume, embedding, tuple(semantic_cache)
+                    )
+                except Exception as e:
+                    logger.warning("Semantic cache lookup failed: %s", e)
+                if resume_data is not None:
+                    logger.info("Step 2: Reusing resume data from a near-duplicate document...")
+        
+            if resume_data is None:
+                # Step 2: Parse resume data using AI (same as Streamlit app)
+                logger.info("Step 2: Analyzing and structuring resume data...")
+                resume_data = await extract_resume_data(client, extracted_text)
+                if embedding is not None and resume_data is not EMPTY_RESUME:
+                    semantic_cache.append((embedding, resume_data))
         
         # Prepare final response (same structure as Streamlit app)
         result = {
@@ -343,20 +684,73 @@ async def parse_resume(file: UploadFile = File(...)):
                 "input_type": content_type,
                 "filename": filename,
                 "total_pages": len(ocr_response.pages),
-                "processor": "Mistral AI Resume Parser"
+                "processor": "Mistral AI Resume Parser",
+                "short_circuited": short_circuited
             },
             "resume": resume_data
         }
         
-        print("Resume processing completed successfully!")
-        return JSONResponse(content=result)
+        # Don't cache failed extractions so a retry gets another attempt
+        if resume_data is not EMPTY_RESUME:
+            cache_result(cache_key, result)
+        
+        logger.info("Resume processing completed successfully!")
+        return result
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Processing error: {str(e)}")
+        logger.exception("Processing error")
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
+@app.get("/")
+async def root():
+    """API information."""
+    return {
+        "message": "AI Resume Parser API",
+        "status": "active",
+        "version": "1.0.0",
+        "description": "Upload resume files (PDF/Image) and get structured JSON data - matches Streamlit app functionality",
+        "endpoints": {
+            "parse_resume": "/parse-resume (POST) - Upload resume file and get structured JSON",
+            "parse_resumes": "/parse-resumes (POST) - Upload several resume files and get a list of results",
+            "health": "/health (GET) - API health check"
+        }
+    }
+
+@app.post("/parse-resume")
+async def parse_resume(request: Request, file: UploadFile = File(...)):
+    """
+    Parse resume from uploaded file (PDF or Image).
+    Returns structured JSON with resume data - exactly like Streamlit app.
+    """
+    result = await parse_resume_file(request.app.state.mistral, request.app.state.cpu_pool, file)
+    return OrjsonResponse(content=result)
+
+@app.post("/parse-resumes")
+async def parse_resumes(request: Request, files: List[UploadFile] = File(...)):
+    """
+    Parse several resume files concurrently (bounded by MAX_IN_FLIGHT).
+    Returns one entry per file in upload order, with either a result or an error.
+    """
+    state = request.app.state
+    results = await asyncio.gather(
+        *(parse_resume_file(state.mistral, state.cpu_pool, file) for file in files),
+        return_exceptions=True
+    )
+    
+    entries = []
+    for file, result in zip(files, results):
+        if isinstance(result, HTTPException):
+            error = {"status_code": result.status_code, "detail": result.detail}
+            entries.append({"filename": file.filename, "result": None, "error": error})
+        elif isinstance(result, Exception):
+            error = {"status_code": 500, "detail": f"Processing error: {str(result)}"}
+            entries.append({"filename": file.filename, "result": None, "error": error})
+        else:
+            entries.append({"filename": file.filename, "result": result, "error": None})
+    return OrjsonResponse(content=entries)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -368,4 +762,13 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Each worker process keeps its own result/semantic caches and its share of MAX_IN_FLIGHT.
+    # loop/http stay on "auto", which picks uvloop and httptools when installed (uvicorn[standard]).
+    uvicorn.run(
+        "resume_parser_api_clean:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WEB_CONCURRENCY,
+        backlog=2048,
+        timeout_keep_alive=30
+    )
\ No newline at end of file
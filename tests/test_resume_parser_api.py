@@ -0,0 +1,274 @@
+import asyncio
+import functools
+import hashlib
+import importlib
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+
+RESUME = {
+    "basics": {"name": "Jane Doe", "email": "jane@example.com"},
+    "work": [{"company": "Acme", "position": "Engineer", "highlights": ["Shipped things"]}],
+    "skills": {"technical": ["Python"]}
+}
+
+OCR_TEXT = "Jane Doe\njane@example.com\n+1 555 123 4567\nEngineer at Acme, 2019-2023"
+
+
+class MockMistral:
+    """State behind mistral_handler: the OCR text to return, whether chat fails and the paths requested so far."""
+
+    def __init__(self):
+        self.ocr_text = OCR_TEXT
+        self.chat_fails = False
+        self.calls = []
+
+
+def mistral_handler(mistral, request):
+    """Answer the Mistral endpoints used by the API with minimal valid payloads."""
+    path = request.url.path
+    mistral.calls.append(path)
+    if request.method == "HEAD":
+        return httpx.Response(200)
+    if path == "/v1/files":
+        assert b"%PDF" in request.read()
+        return httpx.Response(200, json={
+            "id": "file-1",
+            "object": "file",
+            "bytes": 8,
+            "created_at": 0,
+            "filename": "resume.pdf",
+            "purpose": "ocr",
+            "sample_type": "ocr_input",
+            "source": "upload"
+        })
+    if path == "/v1/files/file-1/url":
+        return httpx.Response(200, json={"url": "https://files.example/resume.pdf"})
+    if path == "/v1/ocr":
+        return httpx.Response(200, json={
+            "pages": [{
+                "index": 0,
+                "markdown": mistral.ocr_text,
+                "images": [],
+                "dimensions": {"dpi": 72, "height": 100, "width": 100}
+            }],
+            "model": "mistral-ocr-latest",
+            "usage_info": {"pages_processed": 1}
+        })
+    if path == "/v1/chat/completions" and mistral.chat_fails:
+        return httpx.Response(400, json={"message": "Invalid request"})
+    if path == "/v1/chat/completions":
+        return httpx.Response(200, json={
+            "id": "chat-1",
+            "object": "chat.completion",
+            "model": "mistral-large-latest",
+            "created": 0,
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(RESUME)}
+            }]
+        })
+    if path == "/v1/embeddings":
+        return httpx.Response(200, json={
+            "id": "embd-1",
+            "object": "list",
+            "model": "mistral-embed",
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            "data": [{"object": "embedding", "index": 0, "embedding": [3.0, 4.0]}]
+        })
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def mistral():
+    return MockMistral()
+
+
+@pytest.fixture
+def api(monkeypatch, mistral):
+    monkeypatch.setenv("API_KEY_NAME", "test-key")
+    module = importlib.import_module("resume_parser_api_clean")
+    module.result_cache.clear()
+    module.semantic_cache.clear()
+    # Route the shared AsyncClient (and so the real SDK) through a mock transport
+    transport = httpx.MockTransport(functools.partial(mistral_handler, mistral))
+    monkeypatch.setattr(httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=transport))
+    return module
+
+
+def test_parse_resume_pdf_through_sdk(api):
+    with TestClient(api.app) as client:
+        response = client.post(
+            "/parse-resume",
+            files={"file": ("resume.pdf", b"%PDF-1.4 test", "application/pdf")}
+        )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["metadata"]["input_type"] == "pdf"
+    assert body["metadata"]["total_pages"] == 1
+    assert body["resume"]["basics"]["name"] == "Jane Doe"
+    assert body["resume"]["work"][0]["company"] == "Acme"
+
+
+def test_parse_resumes_pdf_batch_through_sdk(api):
+    with TestClient(api.app) as client:
+        response = client.post(
+            "/parse-resumes",
+            files=[
+                ("files", ("a.pdf", b"%PDF-1.4 first", "application/pdf")),
+                ("files", ("b.pdf", b"%PDF-1.4 second", "application/pdf"))
+            ]
+        )
+
+    assert response.status_code == 200, response.text
+    entries = response.json()
+    assert [entry["filename"] for entry in entries] == ["a.pdf", "b.pdf"]
+    assert all(entry["error"] is None for entry in entries)
+    assert all(entry["result"]["resume"]["basics"]["name"] == "Jane Doe" for entry in entries)
+
+
+def test_parse_resume_json_accepts_nulls_and_string_lists(api):
+    resume = api.parse_resume_json(json.dumps({
+        "basics": {"name": None},
+        "work": [{"company": "Acme", "highlights": None}],
+        "skills": {"technical": None},
+        "interests": [{"name": "Music", "keywords": "jazz, piano"}]
+    }))
+
+    assert resume["basics"]["name"] == ""
+    assert resume["work"][0]["highlights"] == []
+    assert resume["skills"]["technical"] == []
+    assert resume["interests"][0]["keywords"] == ["jazz", "piano"]
+
+
+class FakeChat:
+    """Chat stub returning a fixed first reply and failing the repair call."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = []
+
+    async def complete_async(self, **kwargs):
+        self.calls.append(kwargs)
+        if len(self.calls) > 1:
+            raise RuntimeError("repair unavailable")
+        message = type("Message", (), {"content": self.content})
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+
+def test_extract_resume_data_salvages_valid_sections_when_repair_fails(api):
+    chat = FakeChat(json.dumps({"basics": {"name": "Jane Doe"}, "work": "not a list"}))
+    client = type("Client", (), {"chat": chat})
+
+    resume = asyncio.run(api.extract_resume_data(client, OCR_TEXT))
+
+    assert resume["basics"]["name"] == "Jane Doe"
+    assert resume["work"] == []
+    assert resume.keys() == api.ResumeModel.model_fields.keys()
+    assert "does not match the resume structure" in chat.calls[1]["messages"][1]["content"]
+
+
+def test_extract_resume_data_returns_empty_resume_when_nothing_validates(api):
+    chat = FakeChat(json.dumps({"work": "not a list", "education": 42}))
+    client = type("Client", (), {"chat": chat})
+
+    resume = asyncio.run(api.extract_resume_data(client, OCR_TEXT))
+
+    assert resume is api.EMPTY_RESUME
+
+
+def test_semantic_cache_reuses_near_duplicate(api, monkeypatch, mistral):
+    monkeypatch.setattr(api, "SEMANTIC_CACHE_THRESHOLD", 0.99)
+    with TestClient(api.app) as client:
+        first = client.post("/parse-resume", files={"file": ("a.png", b"first image", "image/png")})
+        second = client.post("/parse-resume", files={"file": ("b.png", b"second image", "image/png")})
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 200, second.text
+    assert second.json()["resume"] == first.json()["resume"]
+    assert mistral.calls.count("/v1/embeddings") == 2
+    assert mistral.calls.count("/v1/chat/completions") == 1
+
+
+def test_looks_like_resume_ignores_date_ranges(api):
+    experience = "Engineer at Acme, 2019 - 2023. Developer at Initech, 2015-2019. " * 2
+
+    assert not api.looks_like_resume(experience)
+    assert api.looks_like_resume(experience + "Phone: +1 555 123 4567")
+    assert api.looks_like_resume(experience + "jane@example.com")
+
+
+def test_parse_resume_short_circuits_without_contact_details(api, mistral):
+    mistral.ocr_text = "Engineer at Acme, 2019 - 2023. Developer at Initech, 2015-2019. " * 2
+    with TestClient(api.app) as client:
+        response = client.post("/parse-resume", files={"file": ("scan.png", b"image", "image/png")})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["metadata"]["short_circuited"] is True
+    assert body["resume"] == api.EMPTY_RESUME
+    assert "/v1/chat/completions" not in mistral.calls
+    assert not api.result_cache
+
+
+def test_cache_hit_returns_fresh_timestamp_and_filename(api, mistral):
+    content = b"%PDF-1.4 cached"
+    api.cache_result(hashlib.blake2b(content, digest_size=16).hexdigest(), {
+        "metadata": {"extraction_timestamp": "2000-01-01T00:00:00", "filename": "old", "input_type": "pdf"},
+        "resume": RESUME
+    })
+    with TestClient(api.app) as client:
+        response = client.post("/parse-resume", files={"file": ("new.pdf", content, "application/pdf")})
+
+    assert response.status_code == 200, response.text
+    metadata = response.json()["metadata"]
+    assert metadata["filename"] == "new"
+    assert metadata["input_type"] == "pdf"
+    assert metadata["extraction_timestamp"] != "2000-01-01T00:00:00"
+    assert response.json()["resume"] == RESUME
+    assert not any(path.startswith(("/v1/files", "/v1/ocr", "/v1/chat")) for path in mistral.calls)
+
+
+def test_repeat_upload_is_served_from_cache(api, mistral):
+    with TestClient(api.app) as client:
+        first = client.post("/parse-resume", files={"file": ("a.pdf", b"%PDF-1.4 same", "application/pdf")})
+        second = client.post("/parse-resume", files={"file": ("b.pdf", b"%PDF-1.4 same", "application/pdf")})
+
+    assert first.status_code == 200, first.text
+    assert second.json()["metadata"]["filename"] == "b"
+    assert second.json()["resume"] == first.json()["resume"]
+    assert mistral.calls.count("/v1/chat/completions") == 1
+
+
+def test_cache_entries_expire_after_ttl(api, monkeypatch):
+    monkeypatch.setattr(api, "RESULT_CACHE_TTL", -1)
+    api.cache_result("key", {"resume": RESUME})
+
+    assert api.get_cached_result("key") is None
+    assert "key" not in api.result_cache
+
+
+def test_cache_evicts_least_recently_used(api, monkeypatch):
+    monkeypatch.setattr(api, "RESULT_CACHE_SIZE", 2)
+    api.cache_result("a", {"resume": "a"})
+    api.cache_result("b", {"resume": "b"})
+    api.get_cached_result("a")
+    api.cache_result("c", {"resume": "c"})
+
+    assert list(api.result_cache) == ["a", "c"]
+
+
+def test_failed_extraction_is_not_cached(api, mistral):
+    mistral.chat_fails = True
+    with TestClient(api.app) as client:
+        response = client.post("/parse-resume", files={"file": ("resume.pdf", b"%PDF-1.4 test", "application/pdf")})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["resume"] == api.EMPTY_RESUME
+    assert not api.result_cache